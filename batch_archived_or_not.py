@@ -1,22 +1,48 @@
 import sys
 import os
+import csv
+import hashlib
+import html
 import json
-import pandas as pd
 import requests.packages
 import requests.api
+import threading
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor, wait
 from datetime import datetime
 from PySide6 import QtGui
 from PySide6.QtCore import QThread, Signal
-from PySide6.QtWidgets import (QApplication, QTextEdit, QWidget, QVBoxLayout, QPushButton, QHBoxLayout, QLabel,
+from PySide6.QtWidgets import (QApplication, QPlainTextEdit, QWidget, QVBoxLayout, QPushButton, QHBoxLayout, QLabel,
                                QFileDialog, QCheckBox, QLineEdit, QProgressBar, QComboBox)
 from PySide6.QtCore import Qt
+from requests.adapters import HTTPAdapter
 from requests.packages.urllib3.exceptions import InsecureRequestWarning
 from creds import APP_API_USERNAME, APP_API_PASSWORD
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from requests_toolbelt import MultipartEncoder
+except ImportError:
+    MultipartEncoder = None
+
 VERSION = "1.1.3"
 URL_TEMPLATE = r"https://{}/api/archived_or_not"
 # ADDRESS = r"localhost:5000" # for testing
 ADDRESS = r"ppdo-dev-app-1.ucsc.edu"
+REQUEST_URL = URL_TEMPLATE.format(ADDRESS)
+RECORDS_PREFIX = "N:\\PPDO\\Records\\" # server locations are relative to the records share
+MAX_WORKERS = 16 # concurrent uploads, and the size of the session's connection pool
+OUTPUT_BATCH_SIZE = 50 # file results per signal sent to the GUI
+CONNECT_TIMEOUT = 10 # seconds
+READ_TIMEOUT = 60 # seconds to wait on the server, raised for large files below
+MIN_BYTES_PER_SECOND = 1 << 20 # slowest the server is expected to get through a large upload
+CANCEL_CHECK_INTERVAL = 0.2 # seconds between cancel checks while waiting on an upload
+LARGE_UPLOAD_SIZE = 16 << 20 # files this big are streamed from disk when requests_toolbelt is installed
+MAX_LARGE_UPLOADS = 2 # large files read into memory at once when they can't be streamed
+SLASH_TO_BACKSLASH = str.maketrans('/', '\\') # server and posix paths are shown Windows-style
 basedir = os.path.dirname(__file__)
 
 headers = {"user": APP_API_USERNAME, "password": APP_API_PASSWORD}
@@ -24,138 +50,334 @@ headers = {"user": APP_API_USERNAME, "password": APP_API_PASSWORD}
 class HeavyLifter(QThread):
     progress = Signal(int)
     finished = Signal(str)
+    results = Signal(list) # batches of (relative path, lines to show under it)
     error = Signal(str)
+    files_to_ignore = frozenset({".DS_Store", "Thumbs.db"})
+    ignore_prefixes = ("~$",) # Office lock files
 
     def __init__(self, path, exclude_src, recursive, only_missing_files, output_type, custom_path, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.path = path
+        # normalized once so every listed path uses the platform separator
+        self.path = os.path.normpath(path)
         self.exclude_src = exclude_src
         self.recursive = recursive
         self.only_missing_files = only_missing_files
         self.output_type = output_type
         self.custom_path = custom_path
-        self.stop = False # new stop flag that resets progress
+        self.stop_event = threading.Event() # set from the GUI thread, checked by the upload workers
+        self.output_buffer = []
+        self.last_progress = -1
+        self.uploads_by_digest = {}
+        self.uploads_lock = threading.Lock()
+        self.large_upload_slots = threading.Semaphore(MAX_LARGE_UPLOADS)
 
     def run(self):
-        self.stop = False
+        self.stop_event.clear()
+        self.output_buffer = []
+        self.last_progress = -1
+        self.uploads_by_digest = {}
         try:
             self.process_files()
         except Exception as e:
+            self.flush_output()
             self.error.emit(f"Error occurred: {str(e)}")
 
     def cancel(self):
-        self.stop = True
+        self.stop_event.set()
 
     def process_files(self):
-        file_ignore = [".DS_Store", "Thumbs.db"]
-        results = {}
-        progress_bar_counter = 0
-        self.progress.emit(0)
-        progress_bar_max = self.find_file_count()
+        filepaths = self.find_files()
+        # the first progress value also switches the GUI's bar from busy to a percentage
+        self.update_progress(0)
 
-        if progress_bar_max == 0:
+        if not filepaths:
             self.finished.emit("No files found.")
             return
 
-        for root, dirs, files in os.walk(self.path):
-            if self.stop:
-                self.finished.emit("<br><b>Process canceled.</b>")
-                self.progress.emit(100)
-                return
-            # iterate through files in directory
-            for file in files:
-                # skip hidden and temp files
-                if self.stop:
-                    self.finished.emit("<br><b>Process canceled.</b>")
-                    self.progress.emit(100)
-                    return
-                if file in file_ignore or file.startswith("~$"):
-                    continue
-
-                # update progress bar
-                progress_bar_counter += 1
-                progress = int((progress_bar_counter * 100) // progress_bar_max)
-                # avoid 0%
-                if progress == 0:
-                    progress = 1
-
-                filepath = os.path.join(root, file)
-                path_relative_to_files_location = os.path.relpath(filepath, self.path)
-                request_url = URL_TEMPLATE.format(ADDRESS)
-                file_locations = []
-
-                # open file and send to server endpoint
-                try:
-                    with open(filepath, 'rb') as f:
-                        files = {'file': f}
-                        response = requests.post(request_url, headers=headers, files=files, verify=False)
-                        filepath = filepath.replace('/', '\\')
-
-                        file_str = "Locations for {}".format(path_relative_to_files_location.replace('/', '\\'))
-                        if not self.only_missing_files:
-                            self.finished.emit("<br><b>{}</b>".format(file_str))
-                        if response.status_code == 404:
-                            if self.only_missing_files:
-                                self.finished.emit("<br><b>{}</b>".format(file_str))
-                            self.finished.emit("\n<pre>    None</pre>")
-                            file_locations = "None"
-                        else:
-                            file_locations = json.loads(response.text)
-                            if self.only_missing_files:
-                                results[filepath] = file_locations
-                            else:
-                                for i in range(len(file_locations)):
-                                    file_locations[i] = "N:\\PPDO\\Records\\{}".format(file_locations[i].replace('/', '\\'))
-                                    self.finished.emit("<pre>    {}</pre>".format(file_locations[i]))
-                                    if self.exclude_src and file_locations[i] == filepath:
-                                        del file_locations[i]
-                except Exception as e:
-                    if 'response' in locals() and response.status_code in [404, 400, 500, 405]:
-                        self.error.emit(f"Request Error:<br>{response.text}")
-                        return
-                self.progress.emit(progress)
-                results[filepath] = file_locations
-
-            if root == self.path and not self.recursive:
-                break
-
+        with self.new_session() as session:
+            executor = ThreadPoolExecutor(max_workers=MAX_WORKERS)
+            # queue all uploads up front so they overlap on the network, then handle responses in walk order
+            uploads = [(filepath, executor.submit(self.upload_file, session, filepath))
+                       for filepath in filepaths]
+            try:
+                results = self.collect_results(uploads)
+            finally:
+                # this runs however collect_results ends. Setting the stop event makes workers skip files they haven't read yet.
+                # Queued uploads are cancelled. Uploads already in flight finish in the background and their
+                # responses are discarded, so shutdown doesn't wait for them.
+                self.stop_event.set()
+                self.cancel_uploads(uploads)
+                executor.shutdown(wait=False)
+
+        if results is None:
+            return
+        self.flush_output()
         self.save_results(results)
         self.finished.emit("<br><b>Search complete.</b>")
 
-    def find_file_count(self):
-        file_count = 0
-        file_ignore = {".DS_Store", "Thumbs.db"}
-
+    def collect_results(self, uploads):
+        # returns None if the run was canceled or stopped by a request error
+        results = {}
+        progress_bar_max = len(uploads)
+
+        # bound once here; these run for every file
+        emit_output = self.emit_output
+        stop_event = self.stop_event
+        # every listed path starts with the input directory, so relative paths are a plain slice
+        relative_path_start = len(os.path.join(self.path, ""))
+        # local paths already use backslashes on Windows; elsewhere they're converted for display
+        translate_local_paths = os.sep != "\\"
+
+        for progress_bar_counter, (filepath, future) in enumerate(uploads, start=1):
+            if stop_event.is_set():
+                self.report_canceled()
+                return None
+
+            # update progress bar, avoiding 0%
+            progress = max(progress_bar_counter * 100 // progress_bar_max, 1)
+
+            path_relative_to_files_location = filepath[relative_path_start:]
+            if translate_local_paths:
+                path_relative_to_files_location = path_relative_to_files_location.translate(SLASH_TO_BACKSLASH)
+                filepath = filepath.translate(SLASH_TO_BACKSLASH)
+
+            # wait for the server response for this file, first showing what's buffered if it isn't back yet,
+            # and keep checking for a cancel so it doesn't have to wait out a slow upload
+            if not future.done():
+                self.flush_output()
+                while not wait((future,), timeout=CANCEL_CHECK_INTERVAL).done:
+                    if stop_event.is_set():
+                        self.report_canceled()
+                        return None
+            try:
+                response = future.result()
+            except CancelledError:
+                # the worker saw the cancel before it started this upload
+                self.report_canceled()
+                return None
+            except OSError as e:
+                # the file couldn't be read or the server couldn't be reached; report it and keep going
+                emit_output(path_relative_to_files_location, [f"Error: {e}"])
+                file_locations = "Error"
+            else:
+                if response.status_code == 404:
+                    emit_output(path_relative_to_files_location, ["None"])
+                    file_locations = "None"
+                else:
+                    server_locations = self.read_locations(response)
+                    if server_locations is None:
+                        self.flush_output()
+                        self.error.emit(f"Request Error:<br>{response.text}")
+                        return None
+
+                    file_locations = [RECORDS_PREFIX + location.translate(SLASH_TO_BACKSLASH)
+                                      for location in server_locations]
+                    if not self.only_missing_files:
+                        emit_output(path_relative_to_files_location, file_locations)
+                    if self.exclude_src:
+                        file_locations = [location for location in file_locations if location != filepath]
+            self.update_progress(progress)
+            results[filepath] = file_locations
+
+        return results
+
+    def update_progress(self, progress):
+        # the bar only shows whole percentages, so skip signals that wouldn't change it
+        if progress != self.last_progress:
+            self.last_progress = progress
+            self.progress.emit(progress)
+
+    def emit_output(self, relative_path, lines):
+        # per-file results are sent to the GUI in batches; one signal per file floods the GUI thread on big trees
+        self.output_buffer.append((relative_path, lines))
+        if len(self.output_buffer) >= OUTPUT_BATCH_SIZE:
+            self.flush_output()
+
+    def flush_output(self):
+        # the GUI receives the list itself, so start a new one rather than clearing it
+        if self.output_buffer:
+            batch, self.output_buffer = self.output_buffer, []
+            self.results.emit(batch)
+
+    @staticmethod
+    def new_session():
+        # one session for the whole run so every upload reuses the same keep-alive connections
+        session = requests.Session()
+        session.headers.update(headers)
+        # every request goes to one host, so size that host's pool to keep one connection alive per worker
+        session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=MAX_WORKERS))
+        return session
+
+    def upload_file(self, session, filepath):
+        # uploads a worker picks up after a cancel are dropped without reading the file
+        if self.stop_event.is_set():
+            raise CancelledError()
+        holds_large_upload_slot = False
+        try:
+            # requests reads the whole body to build the multipart form, so files are read into memory;
+            # large ones are streamed from disk by MultipartEncoder instead when it's available
+            with open(filepath, 'rb') as f:
+                # the size only decides whether to stream, so there's no per-file stat when streaming isn't available
+                size = os.fstat(f.fileno()).st_size if MultipartEncoder is not None else None
+                if size is not None and size >= LARGE_UPLOAD_SIZE:
+                    data = None
+                else:
+                    # the rest of a large file waits for a slot, so every worker holding a big body can't add up to GBs
+                    data = f.read(LARGE_UPLOAD_SIZE)
+                    if len(data) == LARGE_UPLOAD_SIZE:
+                        self.acquire_large_upload_slot()
+                        holds_large_upload_slot = True
+                        data += f.read()
+                    size = len(data)
+
+            # small files share one fixed timeout; big ones get time in proportion to their size
+            timeout = (CONNECT_TIMEOUT, max(READ_TIMEOUT, size / MIN_BYTES_PER_SECOND))
+            if data is None:
+                # streamed files skip the duplicate check; hashing one would read the whole file a second time
+                return self.post_streamed(session, filepath, timeout)
+
+            # the server answers by file content, so copies of the same file share one upload and its response
+            digest = hashlib.sha256(data).digest()
+            with self.uploads_lock:
+                upload = self.uploads_by_digest.get(digest)
+                is_first_copy = upload is None
+                if is_first_copy:
+                    upload = self.uploads_by_digest[digest] = Future()
+            if not is_first_copy:
+                # this copy's body is never sent, so free it and its slot before waiting on the first copy
+                data = None
+                if holds_large_upload_slot:
+                    self.large_upload_slots.release()
+                    holds_large_upload_slot = False
+                return upload.result()
+
+            files = {'file': (os.path.basename(filepath), data, 'application/octet-stream')}
+            try:
+                response = session.post(REQUEST_URL, files=files, verify=False, timeout=timeout)
+            except BaseException as e:
+                upload.set_exception(e)
+                raise
+            upload.set_result(response)
+            return response
+        finally:
+            if holds_large_upload_slot:
+                self.large_upload_slots.release()
+
+    def acquire_large_upload_slot(self):
+        # wait in short steps so a cancel isn't held up behind other large uploads
+        while not self.large_upload_slots.acquire(timeout=CANCEL_CHECK_INTERVAL):
+            if self.stop_event.is_set():
+                raise CancelledError()
+
+    @staticmethod
+    def post_streamed(session, filepath, timeout):
+        # the form is read from the open file as it's sent, so memory use doesn't grow with the file size
+        with open(filepath, 'rb') as f:
+            body = MultipartEncoder(fields={'file': (os.path.basename(filepath), f, 'application/octet-stream')})
+            return session.post(REQUEST_URL, data=body, headers={'Content-Type': body.content_type},
+                                verify=False, timeout=timeout)
+
+    @staticmethod
+    def read_locations(response):
+        # None when the server answered with an error or something other than a list of locations
+        if not response.ok:
+            return None
+        try:
+            # orjson parses the raw bytes directly, skipping the decode to str
+            if orjson is not None:
+                locations = orjson.loads(response.content)
+            else:
+                locations = response.json()
+        except ValueError:
+            return None
+        if not isinstance(locations, list) or not all(isinstance(location, str) for location in locations):
+            return None
+        return locations
+
+    @staticmethod
+    def cancel_uploads(uploads):
+        # drop queued uploads; ones already in flight are left to finish
+        for _, future in uploads:
+            future.cancel()
+
+    def report_canceled(self):
+        self.flush_output()
+        self.finished.emit("<br><b>Process canceled.</b>")
+        self.update_progress(100)
+
+    def find_files(self):
+        # the directory is listed once per run; the list is shared by counting, uploading and progress
         self.finished.emit("<b>Calculating file count...</b>")
-        for _, _, files in os.walk(self.path):
-            for file in files:
-                if file not in file_ignore and not file.startswith("~$"):
-                    file_count += 1
-            if not self.recursive:
-                break
-        self.finished.emit(f"<b>File count completed for {file_count} files.</b>")
-        return file_count
+        filepaths = list(self.scan_files(self.path))
+        self.finished.emit(f"<b>File count completed for {len(filepaths)} files.</b>")
+        return filepaths
+
+    def scan_files(self, directory):
+        # scandir entries carry their file type from the directory listing, so no extra stat calls are needed.
+        # An explicit stack keeps only one directory handle open at a time, however deep the tree goes.
+        pending = [directory]
+        while pending:
+            try:
+                entries = os.scandir(pending.pop())
+            except OSError:
+                # unreadable directories are skipped, same as os.walk
+                continue
+            files = []
+            subdirectories = []
+            with entries:
+                while True:
+                    try:
+                        entry = next(entries)
+                    except StopIteration:
+                        break
+                    except OSError:
+                        # a directory whose listing fails partway is skipped entirely, same as os.walk
+                        files = subdirectories = ()
+                        break
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        # os.walk treats an entry it can't check as a file
+                        is_dir = False
+                    if not is_dir:
+                        # filter on the bare name before anything else is done with the entry
+                        if not self.ignore_file(entry.name):
+                            files.append(entry.path)
+                    elif self.recursive:
+                        try:
+                            is_symlink = entry.is_symlink()
+                        except OSError:
+                            is_symlink = False
+                        if not is_symlink:
+                            subdirectories.append(entry.path)
+            yield from files
+            # reversed so sub-directories come off the stack in listing order, like os.walk
+            pending.extend(reversed(subdirectories))
+
+    def ignore_file(self, filename):
+        # skip hidden and temp files
+        return filename in self.files_to_ignore or filename.startswith(self.ignore_prefixes)
 
 
     def save_results(self, results):
         timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
         output_location = self.custom_path
+        # probe the directory once; every exporter falls back to the working directory when it isn't valid
+        target = output_location if os.path.isdir(output_location) else "default"
 
         try:
             if self.output_type in ['json', 'json and excel']:
-                if os.path.isdir(output_location):
-                    path_name = json_export(results, timestamp, output_location)
-                else:
-                    path_name = json_export(results, timestamp, "default")
+                path_name = json_export(results, timestamp, target)
                 self.finished.emit(f"<br><b>Results JSON file saved to:</b><br>{path_name}")
 
             if self.output_type in ['excel', 'json and excel']:
-                if os.path.isdir(output_location):
-                    path_name = excel_export(results, timestamp, output_location)
-                else:
-                    path_name = excel_export(results, timestamp, "default")
+                path_name = excel_export(results, timestamp, target)
                 self.finished.emit(f"<br><b>Results Excel file saved to:</b><br>{path_name}")
 
+            if self.output_type == 'csv':
+                path_name = csv_export(results, timestamp, target)
+                self.finished.emit(f"<br><b>Results CSV file saved to:</b><br>{path_name}")
+
         except Exception as e:
             self.error.emit(f"Error: Can't export file to requested location. {str(e)}.")
 
@@ -191,7 +413,7 @@ class GuiHandler(QWidget):
         self.layout.addLayout(self.path_layout)  # Added path_layout to main layout
 
         # Optional custom save path section and dropdown
-        self.custom_path_head = QLabel("Optional: Input an output path to save excel/json to or use 'Browse' to "
+        self.custom_path_head = QLabel("Optional: Input an output path to save excel/json/csv to or use 'Browse' to "
                                        "locate a folder, then select a format.", self)
         self.layout.addWidget(self.custom_path_head)
 
@@ -211,6 +433,7 @@ class GuiHandler(QWidget):
         self.save_combo_box.addItem("json")
         self.save_combo_box.addItem("excel")
         self.save_combo_box.addItem("json and excel")
+        self.save_combo_box.addItem("csv")
         self.custom_path_layout.addWidget(self.save_combo_box)
 
         self.layout.addLayout(self.custom_path_layout)  # Added custom_path_layout to main layout
@@ -219,10 +442,10 @@ class GuiHandler(QWidget):
         self.recursive_box = QCheckBox("Should file checking be recursive through nested sub-directories?", self)
         self.layout.addWidget(self.recursive_box)
 
-        self.missing_box = QCheckBox("Only show files that are not found on the server? Useful for reducing the output from this tool (won't effect excel or json output)", self)
+        self.missing_box = QCheckBox("Only show files that are not found on the server? Useful for reducing the output from this tool (won't affect excel, json or csv output)", self)
         self.layout.addWidget(self.missing_box)
 
-        self.exclude_source_box = QCheckBox("ONLY FOR JSON/EXCEL OUTPUT: Exclude the source path for each file. Helpful when looking for files that are already on the R-drive other occurences.", self)
+        self.exclude_source_box = QCheckBox("ONLY FOR JSON/EXCEL/CSV OUTPUT: Exclude the source path for each file. Helpful when looking for files that are already on the R-drive other occurences.", self)
         self.layout.addWidget(self.exclude_source_box)
 
         # Submit button
@@ -247,7 +470,8 @@ class GuiHandler(QWidget):
         self.layout.addLayout(self.submit_layout)  # Added submit_layout to main layout
 
         # Output section
-        self.output_text_edit = QTextEdit(self)
+        # QPlainTextEdit lays out line by line, which stays cheap as thousands of result lines are appended
+        self.output_text_edit = QPlainTextEdit(self)
         self.output_text_edit.setReadOnly(True)
         self.layout.addWidget(self.output_text_edit)
 
@@ -279,14 +503,17 @@ class GuiHandler(QWidget):
         files_location = self.path_line_edit.text().strip()
 
         if not os.path.isdir(files_location):
-            self.output_text_edit.append("Must input valid filepath")
+            self.output_text_edit.appendPlainText("Must input valid filepath")
             return
 
         self.hl = HeavyLifter(files_location, exclude_src, recursive, only_missing_files, output_type, custom_path)
-        self.hl.progress.connect(self.progress_bar.setValue)
+        self.hl.progress.connect(self.update_progress_bar)
         self.hl.finished.connect(self.handle_finished)
-        self.hl.error.connect(self.output_text_edit.append)
+        self.hl.results.connect(self.handle_results)
+        self.hl.error.connect(self.handle_error)
         self.cancel_button.setEnabled(True)
+        # busy indicator until the worker knows how many files there are
+        self.progress_bar.setRange(0, 0)
         self.hl.start()
 
     def cancel_heavylifter(self):
@@ -295,34 +522,76 @@ class GuiHandler(QWidget):
             self.cancel_button.setEnabled(False)
 
     def handle_finished(self, message):
-        self.output_text_edit.append(message)
+        self.output_text_edit.appendHtml(message)
+
+    def handle_results(self, batch):
+        # the worker only sends paths and locations; the markup is built here, off the upload loop
+        parts = []
+        for relative_path, lines in batch:
+            parts.append(f"<br><b>Locations for {html.escape(relative_path)}</b>")
+            parts.extend(f"<pre>    {html.escape(line)}</pre>" for line in lines)
+        self.output_text_edit.appendHtml("".join(parts))
+
+    def handle_error(self, message):
+        self.output_text_edit.appendHtml(message)
+        # don't leave the bar spinning if the file listing itself failed
+        if self.progress_bar.maximum() == 0:
+            self.progress_bar.setRange(0, 100)
+
+    def update_progress_bar(self, value):
+        if self.progress_bar.maximum() == 0:
+            self.progress_bar.setRange(0, 100)
+        self.progress_bar.setValue(value)
+
+def export_filepath(custom_directory_path, time, extension):
+    # "default" saves next to wherever the app was started from
+    if custom_directory_path == "default":
+        custom_directory_path = os.getcwd()
+    return os.path.normpath(os.path.join(custom_directory_path, f'archived_or_not_results_{time}.{extension}'))
 
 def json_export(r, time, custom_directory_path):
-    if custom_directory_path == "default":
-        results_filepath = os.path.join(os.getcwd(), f'archived_or_not_results_{time}.json')
+    results_filepath = export_filepath(custom_directory_path, time, 'json')
+    # orjson encodes the whole dict in one native call; fall back to the standard library when it isn't installed
+    if orjson is not None:
+        with open(results_filepath, 'wb') as f:
+            f.write(orjson.dumps(r, option=orjson.OPT_INDENT_2))
     else:
-        results_filepath = os.path.join(custom_directory_path, f'archived_or_not_results_{time}.json')
-    results_filepath = results_filepath.replace("/", "\\")
-    with open(results_filepath, 'w') as f:
-        json.dump(r, f, indent=4)
+        # written as UTF-8 rather than escaped so the file is the same whichever encoder produced it
+        with open(results_filepath, 'w', encoding='utf-8') as f:
+            json.dump(r, f, ensure_ascii=False, indent=2)
     return results_filepath
 
 def excel_export(r, time, custom_directory_path):
-    if custom_directory_path == "default":
-        results_filepath = os.path.join(os.getcwd(), f'archived_or_not_results_{time}.xlsx')
-    else:
-        results_filepath = os.path.join(custom_directory_path, f'archived_or_not_results_{time}.xlsx')
-    results_filepath = results_filepath.replace("/", "\\")
-    df = pd.DataFrame(columns=["Source Path", "Found Locations"])
+    results_filepath = export_filepath(custom_directory_path, time, 'xlsx')
+    # imported here so runs without Excel output don't pay openpyxl's import cost at startup
+    from openpyxl import Workbook
+
+    # a write-only workbook streams rows out instead of keeping every cell in memory
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Sheet1")
+    ws.append(["Source Path", "Found Locations"])
+    for row in result_rows(r):
+        ws.append(row)
+    wb.save(results_filepath)
+    return results_filepath
+
+def csv_export(r, time, custom_directory_path):
+    results_filepath = export_filepath(custom_directory_path, time, 'csv')
+    # utf-8-sig so Excel picks up the encoding when the file is opened directly
+    with open(results_filepath, 'w', newline='', encoding='utf-8-sig') as f:
+        writer = csv.writer(f)
+        writer.writerow(["Source Path", "Found Locations"])
+        writer.writerows(result_rows(r))
+    return results_filepath
+
+def result_rows(r):
+    # one row per found location; files that weren't found or couldn't be checked get a single "None"/"Error" row
     for key, vals in r.items():
-        if vals == "None":
-            df.loc[len(df.index)] = [key, vals]
+        if isinstance(vals, str):
+            yield key, vals
             continue
         for val in vals:
-            df.loc[len(df.index)] = [key, val]
-    with pd.ExcelWriter(results_filepath, engine="openpyxl") as writer:
-        df.to_excel(writer, index=False)
-    return results_filepath
+            yield key, val
 
 
 